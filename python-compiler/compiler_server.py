@@ -2,17 +2,46 @@
 """
 Multi-language code compiler server
 Similar to the Kotlin version but supports multiple languages
+
+Serve with an ASGI server, e.g.:
+    uvicorn compiler_server:app --host 127.0.0.1 --port 5000 --workers 1
+Set COMPILER_SERVER_LOG_LEVEL (e.g. INFO) to see the server's own log messages there.
 """
 
 import os
-import json
+import argparse
+import logging
+import asyncio
+import atexit
+import queue
+import functools
+import hashlib
+import io
+import re
+import time
+import uuid
 import tempfile
 import subprocess
 import shutil
-from dataclasses import dataclass, asdict
+import signal
+import sys
+from dataclasses import dataclass
 from typing import List, Optional, Dict, Callable, Tuple
-from flask import Flask, request, jsonify, make_response
-from flask_cors import CORS
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+from quart import Quart, request, jsonify, make_response
+from quart_cors import cors
+
+logger = logging.getLogger(__name__)
+
+# Configure logging before the import-time probes below log anything. Only when
+# run as a script, or when asked to under an ASGI server (which sets up just its
+# own loggers); otherwise records propagate to whatever the host configures
+if __name__ == '__main__' or 'COMPILER_SERVER_LOG_LEVEL' in os.environ:
+    logging.basicConfig(level=os.environ.get('COMPILER_SERVER_LOG_LEVEL', 'INFO').upper(),
+                        format='%(asctime)s %(levelname)s %(name)s: %(message)s')
 
 # Fix PATH for Kotlin compiler - ensure proper path concatenation
 kotlin_bin_path = r'C:\kotlinc\bin'
@@ -21,14 +50,32 @@ current_path = os.environ.get('PATH', '')
 # Only add if not already in PATH and if the directory exists
 if kotlin_bin_path not in current_path and os.path.exists(kotlin_bin_path):
     os.environ['PATH'] = kotlin_bin_path + os.pathsep + current_path
-    print(f"Added {kotlin_bin_path} to PATH")
+    logger.info("Added %s to PATH", kotlin_bin_path)
 elif os.path.exists(kotlin_bin_path):
-    print(f"Kotlin path already in PATH: {kotlin_bin_path}")
+    logger.info("Kotlin path already in PATH: %s", kotlin_bin_path)
 else:
-    print(f"Kotlin path does not exist: {kotlin_bin_path}")
+    logger.info("Kotlin path does not exist: %s", kotlin_bin_path)
+
+def resolve_command(*names: str) -> Optional[str]:
+    """Return the absolute path of the first name found in PATH"""
+    for name in names:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+def resolve_launcher(name: str) -> Optional[str]:
+    """Resolve a launcher script, preferring the .bat wrapper on Windows"""
+    if os.name == 'nt':
+        return resolve_command(f'{name}.bat', name)
+    return resolve_command(name)
+
+# Resolve the Kotlin launchers once so they can be run with shell=False; note
+# that Windows still runs .bat files through cmd.exe
+KOTLINC_PATH = resolve_launcher('kotlinc')
+KOTLIN_PATH = resolve_launcher('kotlin')
 
-app = Flask(__name__)
-CORS(app)
+app = cors(Quart(__name__), allow_origin='*')
 
 @dataclass
 class CompileRequest:
@@ -41,89 +88,128 @@ class CompileResponse:
     success: bool
     output: str
     errors: List[str]
+    
+    def to_dict(self) -> Dict[str, object]:
+        """Shallow JSON-ready view; unlike asdict() it doesn't deep-copy output or errors"""
+        return {'success': self.success, 'output': self.output, 'errors': self.errors}
 
+@dataclass(frozen=True)
 class LanguageConfig:
-    def __init__(self, extension: str, compile_cmd: Optional[Callable] = None, 
-                 run_cmd: Callable = None, default_filename: str = None):
-        self.extension = extension
-        self.compile_cmd = compile_cmd
-        self.run_cmd = run_cmd
-        self.default_filename = default_filename
+    # Shared by every request, so never mutated after startup
+    extension: str
+    compile_cmd: Optional[Callable] = None
+    run_cmd: Optional[Callable] = None
+    default_filename: Optional[str] = None
+    # Compiler whose version keys the build cache, and the single file the
+    # compile step produces in the temp dir; languages without an
+    # artifact are never cached
+    compiler: Optional[str] = None
+    artifact: Optional[str] = None
+    # Address-space cap for the run step on POSIX; left unset for runtimes
+    # like the JVM, Go and V8 that reserve large virtual ranges up front
+    memory_limit: Optional[int] = None
+    # Other extensions the toolchain accepts, e.g. .cc for C++
+    alt_extensions: Tuple[str, ...] = ()
+    # The file name doubles as the class to run, so it can't be replaced
+    # by default_filename when the requested one is unusable
+    filename_is_class: bool = False
+
+# Different commands have different version flags
+_VERSION_FLAGS = {
+    'kotlinc': ('-version',),
+    'kotlinc.bat': ('-version',),
+    'kotlin': ('-version',),
+    'kotlin.bat': ('-version',),
+    'javac': ('-version',),
+    'java': ('-version',),
+    'python': ('--version',),
+    'node': ('--version',),
+    'gcc': ('--version',),
+    'g++': ('--version',),
+    'go': ('version',)
+}
+_DEFAULT_VERSION_FLAGS = ('--version',)
+
+# For Windows, try the .bat launcher before the bare command
+_WIN_CMD_ALIASES = {
+    'kotlinc': ('kotlinc.bat', 'kotlinc'),
+    'kotlin': ('kotlin.bat', 'kotlin')
+}
 
 def check_command_exists(cmd: str) -> bool:
     """Check if a command exists in the system PATH"""
+    return probe_command(cmd) is not None
+
+@functools.lru_cache(maxsize=None)
+def probe_command(cmd: str) -> Optional[str]:
+    """Run a command's version flag once and return its banner, or None if it is not usable"""
     try:
-        # For Windows, try both the command and .bat version
-        commands_to_try = [cmd]
-        if os.name == 'nt' and cmd == 'kotlinc':
-            commands_to_try = ['kotlinc.bat', 'kotlinc']
+        commands_to_try = _WIN_CMD_ALIASES.get(cmd, (cmd,)) if os.name == 'nt' else (cmd,)
         
         for command in commands_to_try:
             try:
-                # Different commands have different version flags
-                version_flags = {
-                    'kotlinc': ['-version'],
-                    'kotlinc.bat': ['-version'],
-                    'kotlin': ['-version'],
-                    'javac': ['-version'],
-                    'java': ['-version'],
-                    'python': ['--version'],
-                    'node': ['--version'],
-                    'gcc': ['--version'],
-                    'g++': ['--version'],
-                    'go': ['version']
-                }
+                flag = _VERSION_FLAGS.get(command, _DEFAULT_VERSION_FLAGS)
                 
-                flag = version_flags.get(command, ['--version'])
+                # Resolve up front so .bat files can be run without cmd.exe
+                command_path = shutil.which(command)
+                if command_path is None:
+                    raise FileNotFoundError(command)
                 
-                print(f"Trying command: {command} with flags {flag}")
+                logger.debug("Trying command: %s with flags %s", command_path, flag)
                 
-                # For Windows, use shell=True to handle .bat files properly
                 result = subprocess.run(
-                    [command] + flag, 
+                    [command_path, *flag], 
                     capture_output=True, 
                     timeout=15, 
-                    text=True,
-                    shell=(os.name == 'nt')  # Use shell on Windows
+                    text=True
                 )
                 
-                print(f"Result for {command}: returncode={result.returncode}")
+                logger.debug("Result for %s: returncode=%s", command, result.returncode)
                 if result.stdout:
-                    print(f"  stdout: {result.stdout.strip()[:100]}")
+                    logger.debug("  stdout: %s", result.stdout.strip()[:100])
                 if result.stderr:
-                    print(f"  stderr: {result.stderr.strip()[:100]}")
+                    logger.debug("  stderr: %s", result.stderr.strip()[:100])
+                
+                banner = (result.stdout + result.stderr).strip()
                 
                 # For kotlinc, check if it ran without errors or if output contains version info
                 if command in ['kotlinc', 'kotlinc.bat']:
                     success = result.returncode == 0 or 'kotlin' in result.stderr.lower() or 'kotlin' in result.stdout.lower()
                     if success:
-                        print(f"✓ {command} found and working!")
-                        return True
+                        logger.info("%s found and working", command)
+                        return banner
                 elif result.returncode == 0:
-                    return True
+                    return banner
                     
             except FileNotFoundError:
-                print(f"Command {command} not found in PATH")
+                logger.debug("Command %s not found in PATH", command)
                 continue
             except subprocess.TimeoutExpired:
-                print(f"Command {command} timed out")
+                logger.warning("Command %s timed out", command)
                 continue
             except Exception as e:
-                print(f"Exception with {command}: {e}")
+                logger.warning("Exception with %s: %s", command, e)
                 continue
         
-        return False
+        return None
         
     except Exception as e:
-        print(f"General exception checking {cmd}: {e}")
-        return False
+        logger.warning("General exception checking %s: %s", cmd, e)
+        return None
+
+# JVM options that trade peak throughput for start-up time: a short-lived
+# compile never reaches the C2 JIT, and the serial GC skips the set-up cost
+# of the parallel collectors. Only the compilers get them; the user's program
+# keeps C2, since CPU-bound code runs much slower without it and still has
+# to finish within the run timeout
+JVM_STARTUP_FLAGS = ('-XX:TieredStopAtLevel=1', '-XX:+UseSerialGC')
+# kotlinc and javac forward options prefixed with -J to the JVM they run on
+JVM_LAUNCHER_FLAGS = tuple(f'-J{flag}' for flag in JVM_STARTUP_FLAGS)
 
 def kotlin_compile_cmd(file_path: str, temp_dir: str) -> List[str]:
     """Generate Kotlin compilation command"""
     jar_path = os.path.join(temp_dir, 'program.jar')
-    # Use kotlinc.bat explicitly on Windows
-    kotlinc_cmd = 'kotlinc.bat' if os.name == 'nt' else 'kotlinc'
-    return [kotlinc_cmd, file_path, '-include-runtime', '-d', jar_path]
+    return [KOTLINC_PATH or 'kotlinc', *JVM_LAUNCHER_FLAGS, file_path, '-include-runtime', '-d', jar_path]
 
 def kotlin_run_cmd(file_path: str, temp_dir: str) -> List[str]:
     """Generate Kotlin run command"""
@@ -132,8 +218,37 @@ def kotlin_run_cmd(file_path: str, temp_dir: str) -> List[str]:
 
 def kotlin_interpret_cmd(file_path: str, temp_dir: str) -> List[str]:
     """Alternative: Try to run Kotlin as script (if kotlin command exists)"""
-    kotlin_cmd = 'kotlin.bat' if os.name == 'nt' else 'kotlin'
-    return [kotlin_cmd, '-script', file_path]
+    return [KOTLIN_PATH or 'kotlin', '-script', file_path]
+
+# Kotlin is compiled to a jar with kotlinc when available, otherwise run as
+# a script with the kotlin runner
+KOTLIN_COMPILED_CONFIG = LanguageConfig(
+    extension='.kt',
+    compile_cmd=kotlin_compile_cmd,
+    run_cmd=kotlin_run_cmd,
+    default_filename='Main.kt',
+    compiler='kotlinc',
+    artifact='program.jar'
+)
+
+KOTLIN_SCRIPT_CONFIG = LanguageConfig(
+    extension='.kt',
+    compile_cmd=None,
+    run_cmd=kotlin_interpret_cmd,
+    default_filename='Main.kt'
+)
+
+def select_kotlin_config() -> Optional[LanguageConfig]:
+    """Pick the Kotlin config for the installed toolchain, or None if neither tool works"""
+    if check_command_exists('kotlinc'):
+        return KOTLIN_COMPILED_CONFIG
+    if check_command_exists('kotlin'):
+        logger.info("Using Kotlin script runner instead of kotlinc")
+        return KOTLIN_SCRIPT_CONFIG
+    return None
+
+# Address-space cap for programs run natively or under CPython
+RUN_MEMORY_LIMIT = 512 * 1024 * 1024
 
 # Language configurations
 LANGUAGE_CONFIGS = {
@@ -141,30 +256,30 @@ LANGUAGE_CONFIGS = {
         extension='.py',
         compile_cmd=None,  # Python is interpreted
         run_cmd=lambda file_path, temp_dir: ['python', file_path],
-        default_filename='main.py'
+        default_filename='main.py',
+        memory_limit=RUN_MEMORY_LIMIT
     ),
     'java': LanguageConfig(
         extension='.java',
-        compile_cmd=lambda file_path, temp_dir: ['javac', file_path],
+        compile_cmd=lambda file_path, temp_dir: ['javac', *JVM_LAUNCHER_FLAGS, file_path],
         run_cmd=lambda file_path, temp_dir: [
             'java', '-cp', temp_dir, 
             os.path.splitext(os.path.basename(file_path))[0]
         ],
-        default_filename='Main.java'
-    ),
-    'kotlin': LanguageConfig(
-        extension='.kt',
-        compile_cmd=kotlin_compile_cmd,
-        run_cmd=kotlin_run_cmd,
-        default_filename='Main.kt'
+        default_filename='Main.java',
+        filename_is_class=True
     ),
+    'kotlin': KOTLIN_COMPILED_CONFIG,
     'c': LanguageConfig(
         extension='.c',
         compile_cmd=lambda file_path, temp_dir: [
             'gcc', file_path, '-o', os.path.join(temp_dir, 'program.exe')
         ],
         run_cmd=lambda file_path, temp_dir: [os.path.join(temp_dir, 'program.exe')],
-        default_filename='main.c'
+        default_filename='main.c',
+        compiler='gcc',
+        artifact='program.exe',
+        memory_limit=RUN_MEMORY_LIMIT
     ),
     'cpp': LanguageConfig(
         extension='.cpp',
@@ -172,7 +287,11 @@ LANGUAGE_CONFIGS = {
             'g++', file_path, '-o', os.path.join(temp_dir, 'program.exe')
         ],
         run_cmd=lambda file_path, temp_dir: [os.path.join(temp_dir, 'program.exe')],
-        default_filename='main.cpp'
+        default_filename='main.cpp',
+        alt_extensions=('.cc', '.cxx'),
+        compiler='g++',
+        artifact='program.exe',
+        memory_limit=RUN_MEMORY_LIMIT
     ),
     'javascript': LanguageConfig(
         extension='.js',
@@ -182,36 +301,440 @@ LANGUAGE_CONFIGS = {
     ),
     'go': LanguageConfig(
         extension='.go',
-        compile_cmd=None,  # Go compiles and runs in one step
-        run_cmd=lambda file_path, temp_dir: ['go', 'run', file_path],
-        default_filename='main.go'
+        # Build a binary rather than `go run`, so the artifact can be cached
+        compile_cmd=lambda file_path, temp_dir: [
+            'go', 'build', '-o', os.path.join(temp_dir, 'program.exe'), file_path
+        ],
+        run_cmd=lambda file_path, temp_dir: [os.path.join(temp_dir, 'program.exe')],
+        default_filename='main.go',
+        compiler='go',
+        artifact='program.exe'
     )
 }
 
-def execute_command(cmd: List[str], cwd: str, timeout: int = 30) -> Tuple[str, str, int]:
-    """Execute a command and return stdout, stderr, and return code"""
+def detect_available_languages() -> List[str]:
+    """List the configured languages whose toolchain is usable on this host"""
+    languages = []
+    for lang in LANGUAGE_CONFIGS.keys():
+        if lang == 'kotlin':
+            if check_command_exists('kotlinc') or check_command_exists('kotlin'):
+                languages.append(lang)
+        else:
+            languages.append(lang)
+    return languages
+
+# The toolchain does not change while the server runs, so probe it once at import
+LANGUAGE_CONFIGS['kotlin'] = select_kotlin_config() or KOTLIN_COMPILED_CONFIG
+AVAILABLE_LANGUAGES = detect_available_languages()
+
+def detect_compiler_versions() -> Dict[str, Optional[str]]:
+    """Version banner of every compiler that keys the build cache, None if it couldn't be probed"""
+    configs = [*LANGUAGE_CONFIGS.values(), KOTLIN_COMPILED_CONFIG]
+    return {config.compiler: probe_command(config.compiler) for config in configs if config.compiler}
+
+# Probed up front so requests never block the event loop on a version check
+COMPILER_VERSIONS = detect_compiler_versions()
+
+def _reprobe_toolchain() -> Tuple[LanguageConfig, List[str], Dict[str, Optional[str]]]:
+    """Forget cached command probes and probe again; blocking, so run it off the event loop"""
+    probe_command.cache_clear()
+    kotlin_config = select_kotlin_config() or KOTLIN_COMPILED_CONFIG
+    return kotlin_config, detect_available_languages(), detect_compiler_versions()
+
+async def refresh_available_languages() -> List[str]:
+    """Re-detect the toolchain, e.g. after installing a new compiler, without blocking requests"""
+    global KOTLINC_PATH, KOTLIN_PATH
+    kotlinc_path, kotlin_path = resolve_launcher('kotlinc'), resolve_launcher('kotlin')
+    kotlin_config, languages, compiler_versions = await asyncio.to_thread(_reprobe_toolchain)
+    # Swap everything in at once on the loop thread, so a request never sees
+    # a half-updated toolchain
+    KOTLINC_PATH, KOTLIN_PATH = kotlinc_path, kotlin_path
+    LANGUAGE_CONFIGS['kotlin'] = kotlin_config
+    AVAILABLE_LANGUAGES[:] = languages
+    COMPILER_VERSIONS.clear()
+    COMPILER_VERSIONS.update(compiler_versions)
+    logger.info("Re-probed toolchain, available languages: %s", AVAILABLE_LANGUAGES)
+    return AVAILABLE_LANGUAGES
+
+# Minimum free space to keep on the tmpfs before falling back to disk
+MIN_SCRATCH_FREE_BYTES = 256 * 1024 * 1024
+
+def _scratch_root_has_room(root: Optional[str]) -> bool:
+    return root is None or shutil.disk_usage(root).free >= MIN_SCRATCH_FREE_BYTES
+
+def _choose_scratch_root() -> Optional[str]:
+    """Prefer the RAM-backed /dev/shm on Linux so sources and artifacts never hit the disk"""
+    shm = '/dev/shm'
+    if not sys.platform.startswith('linux') or not os.path.isdir(shm):
+        return None
+    if not os.access(shm, os.W_OK | os.X_OK):
+        return None
+    # Compiled programs are executed from the scratch dir
+    if os.statvfs(shm).f_flag & os.ST_NOEXEC:
+        return None
+    if not _scratch_root_has_room(shm):
+        return None
+    return shm
+
+SCRATCH_ROOT = _choose_scratch_root()
+
+# Scratch directories are created once and reused between requests, since
+# creating and removing a directory per request is slow on Windows
+SCRATCH_POOL_SIZE = 4
+_scratch_dirs: List[str] = []
+_scratch_pool: 'queue.Queue[str]' = queue.Queue()
+
+def _create_scratch_dir() -> str:
+    temp_dir = tempfile.mkdtemp(prefix='compiler_server_', dir=SCRATCH_ROOT)
+    _scratch_dirs.append(temp_dir)
+    return temp_dir
+
+def _clear_scratch_dir(temp_dir: str):
+    """Remove everything left in a scratch directory by a previous request"""
+    for entry in os.scandir(temp_dir):
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path, ignore_errors=True)
+        else:
+            os.unlink(entry.path)
+
+def acquire_scratch_dir() -> str:
+    """Take an empty scratch directory from the pool, creating one if the pool is drained"""
+    if not _scratch_root_has_room(SCRATCH_ROOT):
+        # Don't let a burst of large builds exhaust RAM; use a disk-backed dir instead
+        logger.warning("%s is low on space, using a disk-backed scratch dir", SCRATCH_ROOT)
+        return tempfile.mkdtemp(prefix='compiler_server_')
     try:
-        print(f"Executing command: {' '.join(cmd)} in {cwd}")
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        return _scratch_pool.get_nowait()
+    except queue.Empty:
+        return tempfile.mkdtemp(prefix='compiler_server_', dir=SCRATCH_ROOT)
+
+def release_scratch_dir(temp_dir: str):
+    """Empty a scratch directory and return it to the pool, or delete it if it was an overflow dir"""
+    if temp_dir not in _scratch_dirs:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        return
+    # Clear on release rather than on acquire so a tmpfs doesn't hold stale builds in RAM
+    try:
+        _clear_scratch_dir(temp_dir)
+    except OSError as e:
+        logger.warning("Discarding scratch dir %s: %s", temp_dir, e)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        _scratch_dirs.remove(temp_dir)
+        temp_dir = _create_scratch_dir()
+    _scratch_pool.put(temp_dir)
+
+@atexit.register
+def _remove_scratch_dirs():
+    for temp_dir in _scratch_dirs:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+for _ in range(SCRATCH_POOL_SIZE):
+    _scratch_pool.put(_create_scratch_dir())
+
+# Compiled artifacts are cached on disk by a hash of everything that affects
+# the build, so resubmitting the same snippet skips the compiler entirely
+COMPILE_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.compiler_server_cache')
+COMPILE_CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+# Keep Go's own build cache next to ours so package builds stay warm across
+# requests; Go trims it itself, so it doesn't count towards the limit above
+os.environ.setdefault('GOCACHE', os.path.join(COMPILE_CACHE_DIR, 'go'))
+
+def compile_cache_key(compile_request: CompileRequest, filename: str, config: LanguageConfig) -> Optional[str]:
+    """Hash the source, file name, compiler version and compile command into a cache key"""
+    compiler_version = COMPILER_VERSIONS.get(config.compiler)
+    if not config.artifact or not compiler_version:
+        # Without a known version an upgraded compiler could serve stale builds
+        return None
+    digest = hashlib.sha256()
+    for part in (
+        compile_request.language,
+        filename,
+        compiler_version,
+        ' '.join(config.compile_cmd('<source>', '<out>')),
+        compile_request.code,
+    ):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def _cache_paths(cache_key: str, config: LanguageConfig) -> Tuple[str, str]:
+    artifact_ext = os.path.splitext(config.artifact)[1]
+    base = os.path.join(COMPILE_CACHE_DIR, cache_key)
+    return base + artifact_ext, base + '.log'
+
+def load_cached_artifact(cache_key: str, config: LanguageConfig, temp_dir: str) -> Optional[str]:
+    """Copy a cached artifact into temp_dir and return its compiler output, or None on a miss"""
+    artifact_path, log_path = _cache_paths(cache_key, config)
+    try:
+        with open(log_path, 'r', encoding='utf-8') as f:
+            compile_output = f.read()
+        shutil.copy2(artifact_path, os.path.join(temp_dir, config.artifact))
+        # Eviction is least-recently-used by mtime
+        os.utime(artifact_path)
+        os.utime(log_path)
+        return compile_output
+    except OSError:
+        return None
+
+CACHE_TEMP_PREFIX = '.tmp-'
+
+def _write_cache_file(path: str, write: Callable[[str], None]):
+    """Write a cache file under a name private to this writer, then move it into place"""
+    # Identical submissions compile at the same time, so writers of one key
+    # must never share a temporary file
+    fd, temp_path = tempfile.mkstemp(dir=COMPILE_CACHE_DIR, prefix=CACHE_TEMP_PREFIX)
+    os.close(fd)
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+def _write_text(path: str, text: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+def store_cached_artifact(cache_key: str, config: LanguageConfig, temp_dir: str, compile_output: str):
+    """Save a freshly compiled artifact and its compiler output, then trim the cache"""
+    artifact_path, log_path = _cache_paths(cache_key, config)
+    try:
+        os.makedirs(COMPILE_CACHE_DIR, exist_ok=True)
+        # The artifact goes in first: a reader only trusts an entry once its log exists
+        _write_cache_file(artifact_path, lambda path: shutil.copy2(os.path.join(temp_dir, config.artifact), path))
+        _write_cache_file(log_path, lambda path: _write_text(path, compile_output))
+    except OSError as e:
+        logger.warning("Failed to cache build %s: %s", cache_key, e)
+        return
+    evict_compile_cache()
+
+def evict_compile_cache():
+    """Delete the least recently used cache entries until the cache fits COMPILE_CACHE_MAX_BYTES"""
+    try:
+        entries = []
+        for entry in os.scandir(COMPILE_CACHE_DIR):
+            # Skip files another writer is still filling in
+            if entry.is_file() and not entry.name.startswith(CACHE_TEMP_PREFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= COMPILE_CACHE_MAX_BYTES:
+            break
+        try:
+            os.unlink(path)
+            total -= size
+        except OSError:
+            continue
+
+# Cap on compilers and programs running at once, whatever the ASGI server's
+# concurrency; a burst of requests queues here instead of starting dozens
+# of JVMs. Created per serving loop, so it is None outside the server
+MAX_CONCURRENT_COMMANDS = min(os.cpu_count() or 1, 4)
+COMMAND_SLOTS: Optional[asyncio.Semaphore] = None
+
+@app.before_serving
+async def _create_command_slots():
+    global COMMAND_SLOTS
+    COMMAND_SLOTS = asyncio.Semaphore(MAX_CONCURRENT_COMMANDS)
+
+# Per-stream cap on captured output; a program that prints more is killed
+MAX_OUTPUT_BYTES = 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+
+async def _read_capped(stream: asyncio.StreamReader, proc: asyncio.subprocess.Process) -> Tuple[bytearray, bool]:
+    """Read a pipe until EOF or MAX_OUTPUT_BYTES, killing the process on overflow"""
+    buffer = bytearray()
+    while True:
+        chunk = await stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            return buffer, False
+        room = MAX_OUTPUT_BYTES - len(buffer)
+        buffer += chunk[:room]
+        if len(chunk) > room:
+            await kill_process_tree(proc)
+            return buffer, True
+
+EXIT_POLL_INTERVAL = 0.05
+
+async def _wait_for_exit(proc: asyncio.subprocess.Process):
+    """Wait for the command itself to exit, however long its pipes stay open"""
+    # Process.wait() only returns once every copy of the pipes is closed
+    while proc.returncode is None:
+        await asyncio.sleep(EXIT_POLL_INTERVAL)
+
+async def _communicate_capped(proc: asyncio.subprocess.Process) -> Tuple[bytearray, bytearray, bool]:
+    readers = asyncio.gather(
+        _read_capped(proc.stdout, proc),
+        _read_capped(proc.stderr, proc)
+    )
+    exited = asyncio.ensure_future(_wait_for_exit(proc))
+    try:
+        await asyncio.wait({readers, exited}, return_when=asyncio.FIRST_COMPLETED)
+        # A background child can keep the inherited pipes open after the command
+        # exits; kill the rest of the group so the readers reach EOF
+        if exited.done() and os.name != 'nt':
+            await kill_process_tree(proc)
+        (stdout, stdout_truncated), (stderr, stderr_truncated) = await readers
+        await proc.wait()
+    finally:
+        exited.cancel()
+        if not readers.done():
+            # Cancelled by the timeout; collect the readers so nothing is left pending
+            readers.cancel()
+            await asyncio.gather(readers, return_exceptions=True)
+    return stdout, stderr, stdout_truncated or stderr_truncated
+
+async def kill_process_tree(proc: asyncio.subprocess.Process):
+    """Kill a command together with any processes it spawned"""
+    if os.name == 'nt':
+        # taskkill /T walks the child tree, which needs the parent still alive,
+        # so wait for it to finish before killing the parent directly
+        if proc.returncode is None:
+            try:
+                taskkill = await asyncio.create_subprocess_exec(
+                    'taskkill', '/F', '/T', '/PID', str(proc.pid),
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+                await taskkill.wait()
+            except OSError:
+                pass
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+        return
+    # Each command leads its own session, so its pid is also its process group id
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+# Sets the rlimits and then execs the real command, so they are in place before
+# its first instruction. Used instead of a preexec_fn, which forces a plain
+# fork() and isn't safe while other threads are running
+_RLIMIT_SHIM = '''\
+import os, resource, sys
+cpu_seconds, memory_limit = int(sys.argv[1]), int(sys.argv[2])
+resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+if memory_limit:
+    resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+os.execv(sys.argv[3], sys.argv[3:])
+'''
+
+def with_resource_limits(cmd: List[str], cpu_seconds: int, memory_limit: Optional[int]) -> List[str]:
+    """Wrap a command so it starts under the given rlimits (POSIX only)"""
+    if resource is None:
+        return cmd
+    # Resolve here so a missing command still surfaces as FileNotFoundError
+    executable = shutil.which(cmd[0])
+    if executable is None:
+        raise FileNotFoundError(f"No such file or directory: {cmd[0]!r}")
+    # CPU time is inherited, so the limit also stops grandchildren that escape the group
+    return [sys.executable, '-I', '-S', '-c', _RLIMIT_SHIM,
+            str(cpu_seconds), str(memory_limit or 0), executable, *cmd[1:]]
+
+async def execute_command(cmd: List[str], cwd: str, timeout: int = 30,
+                          memory_limit: Optional[int] = None) -> Tuple[str, str, int]:
+    """Execute a command without blocking the event loop and return stdout, stderr, and return code"""
+    if COMMAND_SLOTS is None:
+        return await _execute_command(cmd, cwd, timeout, memory_limit)
+    # Time spent waiting for a slot doesn't count towards the command's timeout
+    async with COMMAND_SLOTS:
+        return await _execute_command(cmd, cwd, timeout, memory_limit)
+
+async def _execute_command(cmd: List[str], cwd: str, timeout: int,
+                           memory_limit: Optional[int]) -> Tuple[str, str, int]:
+    try:
+        logger.debug("Executing command: %s in %s", cmd, cwd)
+        # Run each command in its own process group so a timeout kills
+        # everything it forked, not just the direct child
+        if os.name == 'nt':
+            isolation = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            isolation = {'start_new_session': True}
+        proc = await asyncio.create_subprocess_exec(
+            *with_resource_limits(cmd, timeout + 1, memory_limit),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
             cwd=cwd,
-            timeout=timeout,
-            env=os.environ.copy(),  # Ensure we use the updated environment
-            shell=(os.name == 'nt')  # Use shell on Windows for .bat files
+            **isolation
         )
-        print(f"Command completed with return code: {result.returncode}")
-        return result.stdout, result.stderr, result.returncode
-    except subprocess.TimeoutExpired:
-        return "", "Execution timed out", 1
+        try:
+            stdout, stderr, truncated = await asyncio.wait_for(_communicate_capped(proc), timeout=timeout)
+        except asyncio.TimeoutError:
+            await kill_process_tree(proc)
+            await proc.wait()
+            return "", "Execution timed out", 1
+        finally:
+            # Kill anything left running in the group, e.g. daemonised children
+            if os.name != 'nt':
+                await kill_process_tree(proc)
+        logger.debug("Command completed with return code: %s", proc.returncode)
+        stderr_text = stderr.decode('utf-8', errors='replace')
+        if truncated:
+            if stderr_text:
+                stderr_text += "\n"
+            stderr_text += f"Output exceeded {MAX_OUTPUT_BYTES // 1024} KB limit; process killed"
+        return stdout.decode('utf-8', errors='replace'), stderr_text, proc.returncode
     except FileNotFoundError as e:
         return "", f"Command not found: {cmd[0]} - {e}", 1
     except Exception as e:
         return "", f"Execution error: {str(e)}", 1
 
-def compile_and_run_code(compile_request: CompileRequest) -> CompileResponse:
+def format_output(compile_output: str, stdout: str, stderr: str) -> str:
+    """Assemble the text shown to the user from compiler and program output"""
+    # Written into one buffer in a single pass; only trailing whitespace is
+    # trimmed, so leading indentation in the program's output is kept
+    buffer = io.StringIO()
+    if compile_output:
+        buffer.write("Compilation successful\n")
+    
+    if stdout:
+        buffer.write("--- Execution Output ---\n")
+        buffer.write(stdout.rstrip())
+    
+    if stderr:
+        if stdout:
+            buffer.write("\n")
+        buffer.write("--- Execution Error ---\n")
+        buffer.write(stderr.rstrip())
+        
+    if not stdout and not stderr:
+        buffer.write("--- No Output ---")
+    
+    return buffer.getvalue()
+
+# On Windows the .bat launchers are run through cmd.exe, which still expands
+# these inside the quotes list2cmdline adds; the rest can't appear in a Windows file name
+UNSAFE_FILENAME_CHARS = re.compile(r'[\x00-\x1f"%!&|<>^*?:]')
+JAVA_CLASS_NAME = re.compile(r'[A-Za-z_$][A-Za-z0-9_$]*')
+
+def resolve_filename(requested: Optional[str], config: LanguageConfig) -> Optional[str]:
+    """Name to save the source under, or None if the language can't run it under another name"""
+    if not requested:
+        return config.default_filename
+    stem, extension = os.path.splitext(re.split(r'[\\/]', requested)[-1])
+    extension = extension.lower()
+    usable = (
+        extension in (config.extension, *config.alt_extensions)
+        and stem and not stem.startswith('-')  # a leading '-' reads as a compiler option
+        and not UNSAFE_FILENAME_CHARS.search(stem)
+    )
+    if config.filename_is_class:
+        return stem + extension if usable and JAVA_CLASS_NAME.fullmatch(stem) else None
+    # Editors send whatever file is open, so fall back rather than refuse
+    return stem + extension if usable else config.default_filename
+
+async def compile_and_run_code(compile_request: CompileRequest) -> CompileResponse:
     """Compile and run code based on the language"""
     
     # Validate language
@@ -224,46 +747,39 @@ def compile_and_run_code(compile_request: CompileRequest) -> CompileResponse:
     
     config = LANGUAGE_CONFIGS[compile_request.language]
     
-    # Special handling for Kotlin if kotlinc is not available
-    if compile_request.language == 'kotlin':
-        kotlinc_available = check_command_exists('kotlinc')
-        kotlin_available = check_command_exists('kotlin')
-        
-        print(f"Kotlin check: kotlinc={kotlinc_available}, kotlin={kotlin_available}")
-        
-        if not kotlinc_available:
-            if kotlin_available:
-                # Try to use kotlin script runner instead
-                config.compile_cmd = None
-                config.run_cmd = kotlin_interpret_cmd
-                print("Using Kotlin script runner instead of kotlinc")
-            else:
-                return CompileResponse(
-                    success=False,
-                    output="",
-                    errors=[
-                        "Kotlin compiler not found. Troubleshooting info:",
-                        f"Kotlin bin path exists: {os.path.exists(kotlin_bin_path)}",
-                        f"kotlinc.bat exists: {os.path.exists(os.path.join(kotlin_bin_path, 'kotlinc.bat'))}",
-                        f"Current PATH contains kotlinc: {kotlin_bin_path in os.environ.get('PATH', '')}",
-                        "Try running kotlinc.bat -version manually in terminal to test"
-                    ]
-                )
+    # The Kotlin config was chosen at startup; report why if neither tool was found
+    if compile_request.language == 'kotlin' and 'kotlin' not in AVAILABLE_LANGUAGES:
+        return CompileResponse(
+            success=False,
+            output="",
+            errors=[
+                "Kotlin compiler not found. Troubleshooting info:",
+                f"Kotlin bin path exists: {os.path.exists(kotlin_bin_path)}",
+                f"kotlinc.bat exists: {os.path.exists(os.path.join(kotlin_bin_path, 'kotlinc.bat'))}",
+                f"Current PATH contains kotlinc: {kotlin_bin_path in os.environ.get('PATH', '')}",
+                "Try running kotlinc.bat -version manually in terminal to test"
+            ]
+        )
     
     # Determine filename
-    if compile_request.fileName:
-        filename = compile_request.fileName
-    else:
-        filename = config.default_filename
+    filename = resolve_filename(compile_request.fileName, config)
+    if filename is None:
+        return CompileResponse(
+            success=False,
+            output="",
+            errors=[f"Invalid file name: {compile_request.fileName!r} "
+                    f"(must be the public class name plus {config.extension})"]
+        )
     
-    # Create temporary directory
-    with tempfile.TemporaryDirectory() as temp_dir:
+    # Borrow a scratch directory from the pool
+    temp_dir = acquire_scratch_dir()
+    try:
         file_path = os.path.join(temp_dir, filename)
         
-        # Write code to file
+        # Write code to file: encode once and hand the bytes to a single write
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(compile_request.code)
+            with open(file_path, 'wb') as f:
+                f.write(compile_request.code.encode('utf-8'))
         except Exception as e:
             return CompileResponse(
                 success=False,
@@ -274,98 +790,171 @@ def compile_and_run_code(compile_request: CompileRequest) -> CompileResponse:
         errors = []
         compile_output = ""
         
-        # Compilation step (if needed)
+        # Compilation step (if needed), skipped when an identical build is cached
         if config.compile_cmd:
-            print(f"Compiling {compile_request.language} code...")
-            compile_cmd = config.compile_cmd(file_path, temp_dir)
-            stdout, stderr, returncode = execute_command(compile_cmd, temp_dir, timeout=60)
+            # Cache reads and writes copy whole artifacts, so keep them off the event loop
+            cache_key = compile_cache_key(compile_request, filename, config)
+            cached_output = None
+            if cache_key:
+                cached_output = await asyncio.to_thread(load_cached_artifact, cache_key, config, temp_dir)
             
-            compile_output = stdout + stderr
-            
-            if returncode != 0:
-                return CompileResponse(
-                    success=False,
-                    output=compile_output,
-                    errors=[f"Compilation failed with exit code: {returncode}"]
-                )
+            if cached_output is not None:
+                logger.debug("Using cached %s build %s", compile_request.language, cache_key[:12])
+                compile_output = cached_output
+            else:
+                logger.debug("Compiling %s code...", compile_request.language)
+                compile_cmd = config.compile_cmd(file_path, temp_dir)
+                stdout, stderr, returncode = await execute_command(compile_cmd, temp_dir, timeout=60)
+                
+                compile_output = stdout + stderr
+                
+                if returncode != 0:
+                    return CompileResponse(
+                        success=False,
+                        output=compile_output,
+                        errors=[f"Compilation failed with exit code: {returncode}"]
+                    )
+                
+                if cache_key:
+                    await asyncio.to_thread(store_cached_artifact, cache_key, config, temp_dir, compile_output)
         
         # Execution step
-        print(f"Running {compile_request.language} code...")
+        logger.debug("Running %s code...", compile_request.language)
         run_cmd = config.run_cmd(file_path, temp_dir)
-        stdout, stderr, returncode = execute_command(run_cmd, temp_dir)
+        stdout, stderr, returncode = await execute_command(run_cmd, temp_dir, memory_limit=config.memory_limit)
         
         # Format output
-        output_parts = []
-        if compile_output:
-            output_parts.append("Compilation successful")
-        
-        if stdout:
-            output_parts.append("--- Execution Output ---")
-            output_parts.append(stdout.strip())
-        
-        if stderr:
-            output_parts.append("--- Execution Error ---")
-            output_parts.append(stderr.strip())
-            
-        if not stdout and not stderr:
-            output_parts.append("--- No Output ---")
+        final_output = format_output(compile_output, stdout, stderr)
         
         if returncode != 0 and stderr:
             errors.append(f"Execution failed with exit code: {returncode}")
         
-        final_output = "\n".join(output_parts) if output_parts else compile_output
-        
         return CompileResponse(
             success=returncode == 0 and not errors,
             output=final_output,
             errors=errors
         )
+    finally:
+        release_scratch_dir(temp_dir)
+
+# Background jobs for clients that send "Prefer: respond-async": /compile
+# answers 202 immediately and the result is fetched from /result/<job_id>
+JOB_RESULT_TTL = 10 * 60
+JOB_PURGE_INTERVAL = 60
+# Jobs still queued or running before new submissions get 503
+MAX_PENDING_JOBS = 32
+
+@dataclass
+class CompileJob:
+    task: 'asyncio.Task[CompileResponse]'
+    finished: Optional[float] = None
+
+JOBS: Dict[str, CompileJob] = {}
+
+def _purge_expired_jobs():
+    """Forget finished jobs whose results were not collected within JOB_RESULT_TTL of finishing"""
+    cutoff = time.monotonic() - JOB_RESULT_TTL
+    for job_id in [job_id for job_id, job in JOBS.items() if job.finished is not None and job.finished < cutoff]:
+        del JOBS[job_id]
+
+def submit_compile_job(compile_request: CompileRequest) -> Optional[str]:
+    """Start compiling in the background and return the job id to poll, or None if too many are pending"""
+    _purge_expired_jobs()
+    if sum(1 for job in JOBS.values() if job.finished is None) >= MAX_PENDING_JOBS:
+        return None
+    job_id = uuid.uuid4().hex
+    job = CompileJob(task=asyncio.create_task(compile_and_run_code(compile_request)))
+    job.task.add_done_callback(lambda task: setattr(job, 'finished', time.monotonic()))
+    JOBS[job_id] = job
+    return job_id
+
+async def _purge_jobs_periodically():
+    while True:
+        await asyncio.sleep(JOB_PURGE_INTERVAL)
+        _purge_expired_jobs()
+
+_job_purger: Optional[asyncio.Task] = None
+
+@app.before_serving
+async def _start_job_purger():
+    global _job_purger
+    _job_purger = asyncio.create_task(_purge_jobs_periodically())
+
+@app.after_serving
+async def _stop_job_purger():
+    if _job_purger is not None:
+        _job_purger.cancel()
+
+# Trivial programs compiled and run at startup to warm the JVM, the Go build
+# cache, the OS page cache and our artifact cache before real traffic arrives
+WARMUP_PROGRAMS = {
+    'python': 'print("Hello")',
+    'java': 'public class Main { public static void main(String[] args) { System.out.println("Hello"); } }',
+    'kotlin': 'fun main() { println("Hello") }',
+    'c': '#include <stdio.h>\nint main(void) { puts("Hello"); return 0; }',
+    'cpp': '#include <iostream>\nint main() { std::cout << "Hello" << std::endl; return 0; }',
+    'javascript': 'console.log("Hello");',
+    'go': 'package main\n\nimport "fmt"\n\nfunc main() { fmt.Println("Hello") }'
+}
+
+async def warm_up_compilers():
+    """Compile and run a hello-world in every available language, discarding the results"""
+    for lang in AVAILABLE_LANGUAGES:
+        code = WARMUP_PROGRAMS.get(lang)
+        if code is None:
+            continue
+        started = time.monotonic()
+        result = await compile_and_run_code(CompileRequest(code=code, language=lang))
+        logger.info("Warmed up %s in %.2fs (success=%s)", lang, time.monotonic() - started, result.success)
 
 @app.route('/health', methods=['GET'])
-def health():
+async def health():
     """Health check endpoint"""
-    response = make_response("OK")
+    response = await make_response("OK")
     response.headers['Access-Control-Allow-Origin'] = '*'
     return response
 
 @app.route('/compile', methods=['POST', 'OPTIONS'])
-def compile_endpoint():
+async def compile_endpoint():
     """Main compilation endpoint"""
     
     # Handle CORS preflight
     if request.method == 'OPTIONS':
-        response = make_response()
+        response = await make_response()
         response.headers['Access-Control-Allow-Origin'] = '*'
         response.headers['Access-Control-Allow-Methods'] = 'POST, OPTIONS'
-        response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
+        response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Prefer'
         return response, 204
     
     try:
         # Parse request
         if not request.is_json:
-            return jsonify(asdict(CompileResponse(
+            return jsonify(CompileResponse(
                 success=False,
                 output="",
                 errors=["Content-Type must be application/json"]
-            ))), 400
+            ).to_dict()), 400
         
-        data = request.get_json()
-        print(f"Received request: {json.dumps(data, indent=2)}")
+        data = await request.get_json()
+        if logger.isEnabledFor(logging.DEBUG) and isinstance(data, dict):
+            # Never log the submitted code itself, only its size
+            logger.debug("Received request: language=%r fileName=%r code=%d chars",
+                         data.get('language'), data.get('fileName'), len(data.get('code') or ''))
         
         if not data:
-            return jsonify(asdict(CompileResponse(
+            return jsonify(CompileResponse(
                 success=False,
                 output="",
                 errors=["Empty request body"]
-            ))), 400
+            ).to_dict()), 400
         
         # Validate required fields
         if 'code' not in data or 'language' not in data:
-            return jsonify(asdict(CompileResponse(
+            return jsonify(CompileResponse(
                 success=False,
                 output="",
                 errors=["Missing required fields: code and language"]
-            ))), 400
+            ).to_dict()), 400
         
         # Create compile request
         compile_request = CompileRequest(
@@ -374,76 +963,139 @@ def compile_endpoint():
             fileName=data.get('fileName')
         )
         
+        # Long compilations can be run as a job instead of holding the request open
+        if 'respond-async' in request.headers.get('Prefer', ''):
+            job_id = submit_compile_job(compile_request)
+            if job_id is None:
+                response = jsonify(CompileResponse(
+                    success=False,
+                    output="",
+                    errors=["Too many pending compile jobs, try again later"]
+                ).to_dict())
+                response.headers['Access-Control-Allow-Origin'] = '*'
+                response.headers['Retry-After'] = '5'
+                return response, 503
+            logger.info("Queued job %s", job_id)
+            
+            response = jsonify({'job_id': job_id, 'status': 'pending'})
+            response.headers['Access-Control-Allow-Origin'] = '*'
+            response.headers['Location'] = f'/result/{job_id}'
+            
+            return response, 202
+        
         # Compile and run
-        result = compile_and_run_code(compile_request)
+        result = await compile_and_run_code(compile_request)
         
-        print(f"Sending response: {json.dumps(asdict(result), indent=2)}")
+        logger.debug("Sending response: success=%s output=%d chars errors=%r",
+                     result.success, len(result.output), result.errors)
         
-        response = jsonify(asdict(result))
+        response = jsonify(result.to_dict())
         response.headers['Access-Control-Allow-Origin'] = '*'
         response.headers['Content-Type'] = 'application/json'
         
         return response
         
     except Exception as e:
-        print(f"Server error: {str(e)}")
+        logger.exception("Server error: %s", e)
         error_response = CompileResponse(
             success=False,
             output="",
             errors=[f"Server error: {str(e)}"]
         )
         
-        response = jsonify(asdict(error_response))
+        response = jsonify(error_response.to_dict())
         response.headers['Access-Control-Allow-Origin'] = '*'
         response.headers['Content-Type'] = 'application/json'
         
         return response, 500
 
+@app.route('/result/<job_id>', methods=['GET'])
+async def get_job_result(job_id: str):
+    """Poll a background compilation started with Prefer: respond-async"""
+    job = JOBS.get(job_id)
+    if job is None:
+        response = jsonify({'job_id': job_id, 'status': 'unknown'})
+        response.headers['Access-Control-Allow-Origin'] = '*'
+        return response, 404
+    
+    if not job.task.done():
+        response = jsonify({'job_id': job_id, 'status': 'pending'})
+        response.headers['Access-Control-Allow-Origin'] = '*'
+        return response, 202
+    
+    del JOBS[job_id]
+    try:
+        result = job.task.result()
+    except Exception as e:
+        logger.error("Job %s failed: %s", job_id, e)
+        result = CompileResponse(
+            success=False,
+            output="",
+            errors=[f"Server error: {str(e)}"]
+        )
+    
+    response = jsonify(result.to_dict())
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
+
 @app.route('/languages', methods=['GET'])
-def get_supported_languages():
+async def get_supported_languages():
     """Get list of supported languages"""
-    languages = []
-    for lang in LANGUAGE_CONFIGS.keys():
-        if lang == 'kotlin':
-            if check_command_exists('kotlinc') or check_command_exists('kotlin'):
-                languages.append(lang)
-        else:
-            languages.append(lang)
-    
     response = jsonify({
-        'languages': languages,
-        'count': len(languages)
+        'languages': AVAILABLE_LANGUAGES,
+        'count': len(AVAILABLE_LANGUAGES)
     })
     response.headers['Access-Control-Allow-Origin'] = '*'
     return response
 
+@app.before_serving
+async def _install_sighup_handler():
+    # Re-probe compilers on SIGHUP; only while serving, so importing the
+    # module doesn't change SIGHUP's default behaviour
+    if not hasattr(signal, 'SIGHUP'):
+        return
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.ensure_future(refresh_available_languages()))
+
+@app.after_serving
+async def _remove_sighup_handler():
+    if hasattr(signal, 'SIGHUP'):
+        asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+
 if __name__ == '__main__':
-    print("Compiler server starting on port 5000...")
-    print(f"Operating System: {os.name}")
-    print(f"Kotlin bin path: {kotlin_bin_path}")
-    print(f"Kotlin bin path exists: {os.path.exists(kotlin_bin_path)}")
-    print(f"kotlinc.bat exists: {os.path.exists(os.path.join(kotlin_bin_path, 'kotlinc.bat'))}")
-    print(f"kotlinc exists: {os.path.exists(os.path.join(kotlin_bin_path, 'kotlinc'))}")
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--warmup', action='store_true',
+                        help='compile a hello-world in each language before serving')
+    args = parser.parse_args()
+    
+    logger.info("Compiler server starting on port 5000...")
+    logger.info("Operating System: %s", os.name)
+    logger.info("Kotlin bin path: %s", kotlin_bin_path)
+    logger.info("Kotlin bin path exists: %s", os.path.exists(kotlin_bin_path))
+    logger.info("kotlinc.bat exists: %s", os.path.exists(os.path.join(kotlin_bin_path, 'kotlinc.bat')))
+    logger.info("kotlinc exists: %s", os.path.exists(os.path.join(kotlin_bin_path, 'kotlinc')))
     
     # Check available languages
     available_languages = []
     for lang in LANGUAGE_CONFIGS.keys():
-        if lang == 'kotlin':
-            kotlinc_exists = check_command_exists('kotlinc')
-            kotlin_exists = check_command_exists('kotlin')
-            print(f"Debug: kotlinc exists = {kotlinc_exists}, kotlin exists = {kotlin_exists}")
-            
-            if kotlinc_exists:
-                available_languages.append(f"{lang} (kotlinc)")
-            elif kotlin_exists:
-                available_languages.append(f"{lang} (script)")
-            else:
-                print(f"⚠️  {lang}: compiler not found")
+        if lang not in AVAILABLE_LANGUAGES:
+            logger.warning("%s: compiler not found", lang)
+        elif LANGUAGE_CONFIGS[lang] is KOTLIN_COMPILED_CONFIG:
+            available_languages.append(f"{lang} (kotlinc)")
+        elif LANGUAGE_CONFIGS[lang] is KOTLIN_SCRIPT_CONFIG:
+            available_languages.append(f"{lang} (script)")
         else:
             available_languages.append(lang)
     
-    print("Available languages:", available_languages)
-    print("Test with:")
-    print('curl -X POST -H "Content-Type: application/json" -d \'{"code":"fun main() { println(\\"Hello from Kotlin!\\") }","language":"kotlin"}\' http://localhost:5000/compile')
+    logger.info("Available languages: %s", available_languages)
+    
+    if args.warmup:
+        asyncio.run(warm_up_compilers())
+    
+    logger.info("Test with:")
+    logger.info('curl -X POST -H "Content-Type: application/json" -d \'{"code":"fun main() { println(\\"Hello from Kotlin!\\") }","language":"kotlin"}\' http://localhost:5000/compile')
     
-    app.run(host='127.0.0.1', port=5000, debug=True)
+    # Serve with uvicorn rather than the debug server, whose reloader and
+    # debugger middleware slow every request
+    import uvicorn
+    uvicorn.run(app, host='127.0.0.1', port=5000, workers=1)